@@ -5,8 +5,17 @@ Tools for finding polymorphisms, and for checking height 1 identities in
 polymorphism minions.
 """
 import string
-from itertools import product, count
-from .structure import product_relation, transpose, Structure
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, product, count
+import numpy as np
+from .structure import (
+    as_relation,
+    compact_product_relation,
+    transpose,
+    MixedRadix,
+    Structure,
+)
 from .reductions import DelayDecode, LabelCover, csp_to_lc
 from .solver import pyco_solver
 
@@ -17,73 +26,156 @@ def polymorphisms(structureA, structureB, arity, solver=pyco_solver):
 
 
 class Components:
-    """Data structure holding connected components of a graph."""
+    """Data structure holding connected components of a graph, i.e., a
+    disjoint-set forest with path halving and union by rank stored in flat
+    integer arrays. The domain is either given as a number `n`, in which
+    case it is `range(n)`, or as an iterable of hashable elements; the
+    elements are then referred to by their positions as codes."""
 
     def __init__(self, domain):
-        self.tree = {a: a for a in domain}
+        if isinstance(domain, int):
+            self.elements, self.index = range(domain), None
+        else:
+            self.elements = tuple(domain)
+            self.index = {a: i for i, a in enumerate(self.elements)}
+        self.parent = array("q", range(len(self.elements)))
+        self.rank = bytearray(len(self.elements))
+
+    def find(self, code):
+        """Returns the code of the current representative of `code`."""
+        parent = self.parent
+        while parent[code] != code:
+            parent[code] = parent[parent[code]]
+            code = parent[code]
+        return code
+
+    def union(self, a, b):
+        """Merges the classes of two codes."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+
+    def code(self, a):
+        return a if self.index is None else self.index[a]
 
     def __call__(self, a):
         """Returns the current representative from the same class as `a`."""
-        cur, same_as = a, ()
-        while self.tree[cur] != cur:
-            cur, same_as = self.tree[cur], same_as + (cur,)
-        for e in same_as:
-            self.tree[e] = cur
-        return cur
+        return self.elements[self.find(self.code(a))]
 
     @property
     def domain(self):
-        return iter(self.tree)
+        return iter(self.elements)
 
     def add(self, a, b):
         """add an edge to the graph possibly collapsing two components"""
-        self.tree[self(a)] = self(b)
+        self.union(self.code(a), self.code(b))
+
+    def add_many(self, a_codes, b_codes):
+        """adds edges between codes `a_codes[i]` and `b_codes[i]`, both are
+        given as sequences (or arrays) of codes"""
+        parent, rank = self.parent, self.rank
+        for a, b in zip(
+            np.asarray(a_codes).tolist(), np.asarray(b_codes).tolist()
+        ):
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            while parent[b] != b:
+                parent[b] = b = parent[parent[b]]
+            if a == b:
+                continue
+            if rank[a] < rank[b]:
+                a, b = b, a
+            parent[b] = a
+            if rank[a] == rank[b]:
+                rank[a] += 1
+
+    def labelling(self):
+        """Returns an array mapping each code to the code of its
+        representative."""
+        labels = np.array(self.parent, dtype=np.int64)
+        while True:
+            roots = labels[labels]
+            if np.array_equal(roots, labels):
+                return labels
+            labels = roots
 
     def items(self):
         """iterates through pairs (a, representive of a/~)"""
-        return ((a, self(a)) for a in self.domain)
+        return (
+            (a, self.elements[r])
+            for a, r in zip(self.elements, self.labelling().tolist())
+        )
 
     def __iter__(self):
         """iterates through representatives of the classes"""
-        return (a for a in self.tree if self.tree[a] == a)
+        return (a for i, a in enumerate(self.elements) if self.parent[i] == i)
 
 
 def cover(domain, edges):
     """Yields from a subset of vertices so that each other vertex is reachable
     from this set.  This is based on Kosaraju's algorithm for strongly
-    connected components."""
+    connected components; both passes are iterative and run in linear
+    time."""
 
     neighbours = {v: [] for v in domain}
     for u, v in edges:
         neighbours[u].append(v)
 
-    to_visit, stack = set(domain), list()
-
-    def build_stack(v):
-        if v not in to_visit:
-            return
-        to_visit.remove(v)
-
-        for u in neighbours[v]:
-            build_stack(u)
-        stack.append(v)
-
-    for v in domain:
-        build_stack(v)
-
-    def remove_reachable(v):
-        for u in neighbours[v]:
-            if u in stack:
-                stack.remove(u)
-                remove_reachable(u)
-
-    while True:
-        try:
-            v = stack.pop()
-            yield v
-            remove_reachable(v)
-        except IndexError:
-            return
+    # first pass: list vertices in the order in which their DFS finishes
+    visited, stack = set(), list()
+    for root in neighbours:
+        if root in visited:
+            continue
+        visited.add(root)
+        path = [(root, iter(neighbours[root]))]
+        while path:
+            v, successors = path[-1]
+            for u in successors:
+                if u not in visited:
+                    visited.add(u)
+                    path.append((u, iter(neighbours[u])))
+                    break
+            else:
+                path.pop()
+                stack.append(v)
+
+    # second pass: the last finished vertex reaches all of its component
+    reached = set()
+    while stack:
+        v = stack.pop()
+        if v in reached:
+            continue
+        reached.add(v)
+        yield v
+        to_visit = [v]
+        while to_visit:
+            for u in neighbours[to_visit.pop()]:
+                if u not in reached:
+                    reached.add(u)
+                    to_visit.append(u)
+
+
+def tuple_digits(size, arity):
+    """The array of all tuples of `product(range(size), repeat=arity)` in
+    the order of their mixed-radix codes."""
+    if arity == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    return np.indices((size,) * arity, dtype=np.int64).reshape(arity, -1).T
+
+
+def minor_codes(size, arity, pi):
+    """The codes of tuples `x_pi` for each tuple `x` of length `arity` over
+    a `size`-element set (listed by codes), where `pi` is given as a tuple
+    of pairs `(i, pi(i))`."""
+    pi = dict(pi)
+    weights = size ** np.arange(len(pi) - 1, -1, -1, dtype=np.int64)
+    xs = tuple_digits(size, arity)
+    return xs[:, [pi[i] for i in range(len(pi))]] @ weights
 
 
 def indicator_structure(Template, Sigma):
@@ -91,43 +183,82 @@ def indicator_structure(Template, Sigma):
     builds the indicator structure of Sigma over A
     and passes the identification object"""
 
-    # Construct the domain of the indicator by factoring
+    # Construct the domain of the indicator by factoring; each element
+    # (f, x) is represented by the code of x shifted by the offset of f
     arities = dict(Sigma.vars)
-    domain = (
-        (f, x)
-        for f, arity in arities.items()
-        for x in product(Template.domain, repeat=arity)
+    size = len(Template.domain)
+    offsets = dict(
+        zip(
+            arities,
+            accumulate(
+                (size**arity for arity in arities.values()), initial=0
+            ),
+        )
     )
-    identify = Components(domain)
+    total = sum(size**arity for arity in arities.values())
+
+    identify = Components(total)
     for scope, relation in Sigma.constraints:
         f, g = scope
-        pi = {x: y for x, y in relation}
-        for x in product(Template.domain, repeat=arities[g]):
-            x_pi = tuple(x[pi[i]] for i in range(arities[f]))
-            identify.add((f, x_pi), (g, x))
+        identify.add_many(
+            minor_codes(size, arities[g], relation) + offsets[f],
+            np.arange(size ** arities[g], dtype=np.int64) + offsets[g],
+        )
+    representative = identify.labelling()
+
+    # name the classes by their representatives (f, x)
+    symbols, starts = tuple(offsets), tuple(offsets.values())
+    codes = np.unique(representative)
+    position = np.searchsorted(codes, representative)
+
+    labels = {
+        f: MixedRadix(*(Template.domain,) * arity)
+        for f, arity in arities.items()
+    }
 
-    variables = iter(identify)
+    def name(code):
+        f = symbols[bisect_right(starts, code) - 1]
+        return (f, labels[f][code - offsets[f]])
+
+    variables = tuple(map(name, codes.tolist()))
 
     # impose constraints that cover all thats necessary
     important_fs = tuple(
         cover(arities, (scope for scope, rel in Sigma.constraints))
     )
+    inverse = {a: i for i, a in enumerate(Template.domain)}
 
     def indicator_relation(template_relation):
-        return set(
-            tuple(identify((f, x)) for x in xs)
+        template_relation = as_relation(
+            [[inverse[a] for a in edge] for edge in template_relation]
+        )
+        edges = tuple(
+            position[
+                compact_product_relation(
+                    ((template_relation, size),) * arities[f]
+                )
+                + offsets[f]
+            ]
             for f in important_fs
-            for xs in product_relation(template_relation, repeat=arities[f])
         )
+        if not edges or sum(map(len, edges)) == 0:
+            return ()
+        edges = np.unique(np.concatenate(edges), axis=0)
+        return (tuple(variables[i] for i in edge) for edge in edges.tolist())
 
     rels = (indicator_relation(relation) for relation in Template.relations)
 
     def decode(homomorphism):
+        values = tuple(homomorphism[v] for v in variables)
         polymorphisms = dict()
         for f, arity in arities.items():
+            start = offsets[f]
             polymorphisms[f] = {
-                x: homomorphism[identify((f, x))]
-                for x in product(Template.domain, repeat=arity)
+                x: values[i]
+                for x, i in zip(
+                    product(Template.domain, repeat=arity),
+                    position[start : start + size**arity].tolist(),
+                )
             }
         return polymorphisms
 
@@ -14,10 +14,11 @@ second instance into a solution of the first instance. The output is encoded
 in a monad which is an abstraction that will allow us easily compose
 reductions by using `bind`.
 
-We also provide a helper function `csp_solver(sat_solver)` which produces a
-csp_solver from a sat_solver.
+The helper function `csp_solver(sat_solver)` which produces a csp_solver from
+a sat_solver is provided in `solver.py`.
 """
 from itertools import combinations, count
+from math import isqrt
 from .structure import transpose
 
 
@@ -37,6 +38,24 @@ class DelayDecode:
     def solve(self, solver):
         yield from map(self.decode, solver(self.instance))
 
+    def count(self, solver):
+        """counts solutions without decoding them"""
+        return sum(1 for _ in solver(self.instance))
+
+
+class Clauses:
+    """A SAT instance: a re-iterable collection of clauses produced by the
+    function `clauses`. The variables `1, ..., primary` are those that
+    determine a solution, the others are auxiliary and determined by them,
+    which allows enumerating solutions projected to primary variables."""
+
+    def __init__(self, clauses, primary):
+        self.clauses = clauses
+        self.primary = primary
+
+    def __iter__(self):
+        return self.clauses()
+
 
 class LabelCover:
     """An instance of label cover, or a minor condition. Just a named tuple
@@ -86,28 +105,131 @@ def csp_to_lc(in_instance):
     return DelayDecode(LabelCover(variables, constraints()), decode)
 
 
-def lc_to_sat(lc):
+def pairwise(scope, fresh):
+    """At most one literal of `scope` is true: forbids each pair."""
+    for a, b in combinations(scope, 2):
+        yield (-a, -b)
+
+
+def sequential(scope, fresh):
+    """At most one literal of `scope` is true: Sinz's sequential counter,
+    the i-th auxiliary variable is true iff one of the first i literals
+    is."""
+    if len(scope) < 2:
+        return
+    prev = fresh()
+    yield (-scope[0], prev)
+    yield (-prev, scope[0])
+    for x in scope[1:-1]:
+        s = fresh()
+        yield (-x, s)
+        yield (-prev, s)
+        yield (-x, -prev)
+        yield (-s, prev, x)
+        prev = s
+    yield (-scope[-1], -prev)
+
+
+def commander(scope, fresh, group_size=3):
+    """At most one literal of `scope` is true: the commander encoding of
+    Klieber and Kwon, the commander of a group is true iff one of the
+    group is."""
+    if len(scope) <= group_size + 1:
+        yield from pairwise(scope, fresh)
+        return
+    commanders = []
+    for i in range(0, len(scope), group_size):
+        group, c = scope[i : i + group_size], fresh()
+        yield from pairwise(group, fresh)
+        yield (-c,) + group
+        for x in group:
+            yield (-x, c)
+        commanders.append(c)
+    yield from commander(tuple(commanders), fresh, group_size)
+
+
+def product_encoding(scope, fresh):
+    """At most one literal of `scope` is true: Chen's product encoding,
+    the literals are placed in a grid, and the auxiliary variables of a
+    row (a column) are true iff one of the row (the column) is."""
+    if len(scope) <= 4:
+        yield from pairwise(scope, fresh)
+        return
+    width = isqrt(len(scope) - 1) + 1
+    rows, columns = [], []
+    for i in range(0, len(scope), width):
+        rows.append(fresh())
+        yield (-rows[-1],) + scope[i : i + width]
+    for j in range(width):
+        columns.append(fresh())
+        yield (-columns[-1],) + scope[j::width]
+    for i, x in enumerate(scope):
+        yield (-x, rows[i // width])
+        yield (-x, columns[i % width])
+    yield from product_encoding(tuple(rows), fresh)
+    yield from product_encoding(tuple(columns), fresh)
+
+
+def binary(scope, fresh):
+    """At most one literal of `scope` is true: the binary (logarithmic)
+    encoding, the i-th literal forces auxiliary bits to spell i."""
+    bits = tuple(fresh() for _ in range((len(scope) - 1).bit_length()))
+    for i, x in enumerate(scope):
+        for j, bit in enumerate(bits):
+            yield (-x, bit if i >> j & 1 else -bit)
+
+
+ENCODINGS = {
+    "pairwise": pairwise,
+    "sequential": sequential,
+    "commander": commander,
+    "product": product_encoding,
+    "binary": binary,
+}
+
+
+def auto_encoding(scope, fresh):
+    """Pairwise encoding for small domains, commander encoding otherwise."""
+    if len(scope) <= 8:
+        return pairwise(scope, fresh)
+    return commander(scope, fresh)
+
+
+def lc_to_sat(lc, encoding="auto"):
     """converts a LC instance to a list of SAT clauses
-    returns an iterator over clauses and a decode function"""
+    returns an iterator over clauses and a decode function
+
+    `encoding` chooses how the 'at most one label' part of each variable is
+    encoded, it is one of 'pairwise', 'sequential', 'commander', 'product',
+    'binary', 'auto', or a function as above. All of them use auxiliary
+    variables that are determined by the labels, so models of the output
+    correspond one-to-one to solutions."""
+    at_most_one = (
+        auto_encoding
+        if encoding == "auto"
+        else ENCODINGS.get(encoding, encoding)
+    )
+    if not callable(at_most_one):
+        raise ValueError(f"Unknown encoding '{encoding}'.")
 
     variables = (False,) + tuple((v, a) for v, d in lc.vars for a in range(d))
     table = {va: i for i, va in enumerate(variables) if i > 0}
 
-    def exactly_one(pairs):
+    def exactly_one(pairs, fresh):
         scope = tuple(table[va] for va in pairs)
         yield scope
-        for a, b in combinations(scope, 2):
-            yield (-a, -b)
+        yield from at_most_one(scope, fresh)
 
     def cnfs():
+        fresh = count(len(variables)).__next__
         for v, d in lc.vars:
-            yield from exactly_one((v, a) for a in range(d))
+            yield from exactly_one(((v, a) for a in range(d)), fresh)
         for pair, pi in lc.constraints:
             vs, v = pair
             for x, pix in pi:
                 yield (-table[(vs, x)], table[(v, pix)])
 
     def decode(solution):
-        return dict(variables[x] for x in solution if x > 0)
+        return dict(variables[x] for x in solution if 0 < x < len(variables))
 
-    return DelayDecode(cnfs(), decode)
+    return DelayDecode(Clauses(cnfs, len(variables) - 1), decode)
@@ -1,18 +1,147 @@
 """
 CSP SOLVER
 
-This module provides a CSP solver. Currently, the only available solver is a
-hook for pycosat using a reduction to SAT through label cover.
+This module provides a CSP solver. Currently, the available solvers are a
+hook for pycosat and a hook for external SAT solvers reading DIMACS files, both
+using a reduction to SAT through label cover.
 """
+import os
+import subprocess
+import tempfile
+from functools import partial
 import pycosat
 from .reductions import csp_to_lc, lc_to_sat
 
 
-def csp_solver(sat_solver):
-    def solver(*csp_instance):
-        yield from csp_to_lc(csp_instance).bind(lc_to_sat).solve(sat_solver)
+class CSPSolver:
+    """A CSP solver obtained from a SAT solver through label cover. It is
+    called with a CSP instance `(Input, Template)` and iterates through
+    solutions; `count` only counts them without decoding."""
+
+    def __init__(self, sat_solver, encoding="auto"):
+        self.sat_solver = sat_solver
+        self.encoding = encoding
+
+    def reduce(self, *csp_instance):
+        to_sat = partial(lc_to_sat, encoding=self.encoding)
+        return csp_to_lc(csp_instance).bind(to_sat)
+
+    def __call__(self, *csp_instance):
+        yield from self.reduce(*csp_instance).solve(self.sat_solver)
+
+    def count(self, *csp_instance):
+        return self.reduce(*csp_instance).count(self.sat_solver)
+
+
+def csp_solver(sat_solver, encoding="auto"):
+    """Produces a CSP solver from a SAT solver; `encoding` is passed to
+    `lc_to_sat`."""
+    return CSPSolver(sat_solver, encoding)
+
+
+def blocking_clause(model, primary=None):
+    """The clause excluding `model`. If the instance has `primary` variables
+    1, ..., primary which are grouped into exactly-one constraints (as in
+    `lc_to_sat`), it is enough to block the true primary literals."""
+    if primary is None:
+        return [-x for x in model]
+    return [-x for x in model if 0 < x <= primary]
+
+
+def projected_itersolve(clauses):
+    """Iterates through models of pycosat projected to the primary variables
+    of `clauses` (see `reductions.Clauses`), i.e., models which differ only
+    in auxiliary variables are produced only once."""
+    primary = getattr(clauses, "primary", None)
+    clauses = list(clauses)
+    while True:
+        model = pycosat.solve(clauses)
+        if model == "UNSAT":
+            return
+        yield model
+        clauses.append(blocking_clause(model, primary))
 
-    return solver
 
+pyco_solver = csp_solver(projected_itersolve)
 
-pyco_solver = csp_solver(pycosat.itersolve)
+HEADER = "p cnf {} {}"
+HEADER_WIDTH = 64
+
+
+def write_header(file, variables, clauses):
+    header = HEADER.format(variables, clauses)
+    file.write(header.ljust(HEADER_WIDTH - 1) + "\n")
+
+
+def write_dimacs(clauses, file):
+    """Streams clauses to a seekable text file in the DIMACS format. The
+    header is written as a padded placeholder which is filled in at the end,
+    so the clauses are never held in memory.
+    returns: the number of variables and the number of clauses"""
+    start = file.tell()
+    write_header(file, 0, 0)
+    variables = size = 0
+    for clause in clauses:
+        clause = tuple(clause)
+        if clause:
+            variables = max(variables, max(map(abs, clause)))
+        file.write(" ".join(map(str, clause + (0,))) + "\n")
+        size += 1
+    end = file.tell()
+    file.seek(start)
+    write_header(file, variables, size)
+    file.seek(end)
+    return variables, size
+
+
+def parse_model(output):
+    """parses the output of a solver in the format of the SAT competition;
+    returns the model, or None if the instance is unsatisfiable"""
+    model, status = [], None
+    for line in output.splitlines():
+        if line.startswith("s "):
+            status = line[2:].strip()
+        elif line.startswith("v "):
+            model.extend(int(lit) for lit in line[2:].split() if lit != "0")
+    if status == "SATISFIABLE":
+        return model
+    if status == "UNSATISFIABLE":
+        return None
+    raise RuntimeError(f"SAT solver did not decide the instance: {status}")
+
+
+def dimacs_solver(command):
+    """Produces a SAT solver running an external program, e.g.,
+    `dimacs_solver(['kissat', '-q'])`. The clauses are streamed to a
+    temporary DIMACS file whose path is appended to `command`, and the
+    output is expected in the format of the SAT competition. All solutions
+    are enumerated by re-solving with a clause blocking the previous
+    model (projected to primary variables) appended to the file."""
+
+    def solver(clauses):
+        primary = getattr(clauses, "primary", None)
+        with tempfile.NamedTemporaryFile(
+            "w+", suffix=".cnf", delete=False
+        ) as file:
+            path = file.name
+            variables, size = write_dimacs(clauses, file)
+        try:
+            while True:
+                result = subprocess.run(
+                    [*command, path], capture_output=True, text=True
+                )
+                model = parse_model(result.stdout)
+                if model is None:
+                    return
+                yield model
+                with open(path, "r+") as file:
+                    file.seek(0, os.SEEK_END)
+                    block = blocking_clause(model, primary) + [0]
+                    file.write(" ".join(map(str, block)) + "\n")
+                    size += 1
+                    file.seek(0)
+                    write_header(file, variables, size)
+        finally:
+            os.remove(path)
+
+    return solver
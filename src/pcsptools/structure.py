@@ -4,7 +4,9 @@ STRUCTURE
 The `Structure` class and severel predefined structures.
 """
 from itertools import product, starmap
-from functools import cached_property
+from functools import cached_property, reduce
+from math import prod
+import numpy as np
 
 
 def transpose(matrix):
@@ -72,6 +74,17 @@ class Structure:
         automorphism."""
         return self.expand(*(((a,),) for a in self.domain))
 
+    def compact(self):
+        """Returns the same structure in the compact, integer-indexed form."""
+        inverse = {a: i for i, a in enumerate(self.domain)}
+        return CompactStructure(
+            self.domain,
+            *(
+                [[inverse[a] for a in edge] for edge in relation]
+                for relation in self.relations
+            ),
+        )
+
     def __pow__(self, exponent):
         return self.power(exponent)
 
@@ -89,5 +102,149 @@ def product_structure(*args, **cwargs):
         *starmap(
             lambda *rels: product_relation(*rels, **cwargs),
             transpose(struc.relations for struc in args),
+        ),
+    )
+
+
+class MixedRadix:
+    """The sequence of tuples `product(*factors)` indexed by mixed-radix
+    codes, i.e., the tuple `(x_1, ..., x_k)` has the code
+    `(...(i_1 * n_2 + i_2) * n_3 + ...) + i_k` where `i_j` is the index of
+    `x_j` in the `j`-th factor of size `n_j`. Tuples are computed on demand."""
+
+    def __init__(self, *factors):
+        self.factors = factors
+        self.radices = tuple(map(len, factors))
+
+    def __len__(self):
+        return prod(self.radices)
+
+    def __iter__(self):
+        return product(*self.factors)
+
+    def __getitem__(self, code):
+        if not 0 <= code < len(self):
+            raise IndexError("Code out of range.")
+        digits = []
+        for radix in reversed(self.radices):
+            code, digit = divmod(code, radix)
+            digits.append(digit)
+        return tuple(
+            factor[digit]
+            for factor, digit in zip(self.factors, reversed(digits))
+        )
+
+    def index(self, element):
+        code = 0
+        for factor, radix, x in zip(self.factors, self.radices, element):
+            code = code * radix + factor.index(x)
+        return code
+
+
+def as_relation(rows, arity=None):
+    """Converts rows of integers to an array of shape (|R|, arity)."""
+    relation = np.asarray(rows, dtype=np.int64)
+    if relation.size == 0:
+        return np.empty((0, arity or 0), dtype=np.int64)
+    return relation.reshape(len(relation), -1)
+
+
+class CompactStructure:
+    """A relational structure in a compact form: the domain is
+    {0, ..., n-1}, and each relation is an integer array of shape
+    (|R|, arity). The original elements are kept as `labels`, i.e., `i`
+    stands for `labels[i]`.
+
+    Initialises by giving as arguments (labels, relation_1, etc.) where
+    relations are given by indices into labels."""
+
+    def __init__(self, labels, *relations):
+        self.labels = (
+            labels if isinstance(labels, MixedRadix) else tuple(labels)
+        )
+        self.relations = tuple(map(as_relation, relations))
+
+    @property
+    def domain(self):
+        return range(len(self.labels))
+
+    @cached_property
+    def type(self):
+        return tuple(
+            relation.shape[1] if len(relation) else None
+            for relation in self.relations
+        )
+
+    def check(self):
+        for relation in self.relations:
+            if relation.size and (
+                relation.min() < 0 or relation.max() >= len(self.labels)
+            ):
+                raise ValueError("Relation defined on a bigger domain.")
+        return True
+
+    is_similar = Structure.is_similar
+
+    def structure(self):
+        """Returns the labelled form of this structure."""
+        return Structure(
+            self.labels,
+            *(
+                (
+                    tuple(self.labels[a] for a in edge)
+                    for edge in relation.tolist()
+                )
+                for relation in self.relations
+            ),
+        )
+
+    def power(self, exponent):
+        return compact_product_structure(self, repeat=exponent)
+
+    def product(self, other):
+        return compact_product_structure(self, other)
+
+    def expand(self, *relations):
+        """Returns an expanded structure, new relations are given by
+        indices."""
+        return CompactStructure(self.labels, *self.relations, *relations)
+
+    def singleton_expansion(self):
+        """Adds singletons so that the resulting structure has a single
+        automorphism."""
+        return self.expand(
+            *np.arange(len(self.labels), dtype=np.int64).reshape(-1, 1, 1)
         )
+
+    def __pow__(self, exponent):
+        return self.power(exponent)
+
+    def __mul__(self, other):
+        return self.product(other)
+
+
+def compact_product_relation(relation_size_pairs):
+    """Codes of the tuples of `product_relation` of the given relations, each
+    given together with the size of its domain."""
+
+    def multiply(left, right):
+        (rel1, size1), (rel2, size2) = left, right
+        arity = max(rel1.shape[1], rel2.shape[1])
+        if len(rel1) == 0 or len(rel2) == 0:
+            return np.empty((0, arity), dtype=np.int64), size1 * size2
+        rows = rel1[:, None, :] * size2 + rel2[None, :, :]
+        return rows.reshape(-1, arity), size1 * size2
+
+    return reduce(multiply, relation_size_pairs)[0]
+
+
+def compact_product_structure(*args, repeat=1):
+    factors = args * repeat
+    sizes = tuple(len(struc.labels) for struc in factors)
+    return CompactStructure(
+        MixedRadix(*(struc.labels for struc in factors)),
+        *(
+            compact_product_relation(tuple(zip(rels, sizes)))
+            for rels in transpose(struc.relations for struc in factors)
+        ),
     )
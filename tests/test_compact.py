@@ -0,0 +1,38 @@
+from pcsptools import *
+from pcsptools.structure import CompactStructure, MixedRadix
+
+
+def same_structure(first, second):
+    return set(first.domain) == set(second.domain) and all(
+        set(r) == set(s) for r, s in zip(first.relations, second.relations)
+    )
+
+def test_roundtrip():
+    structure = nae(3, arity=4)
+    compact = structure.compact()
+    assert compact.type == structure.type
+    assert compact.relations[0].shape == (3**4 - 3, 4)
+    assert same_structure(compact.structure(), structure)
+
+def test_compact_power():
+    powr = clique(3).compact().power(3)
+    assert powr.check()
+    assert powr.relations[0].shape == (6**3, 2)
+    assert same_structure(powr.structure(), clique(3).power(3))
+
+def test_compact_product():
+    prod = clique(3).compact() * cycle(5).compact()
+    assert len(prod.domain) == 15
+    assert same_structure(prod.structure(), clique(3) * cycle(5))
+
+def test_compact_expansion():
+    rigid = clique(3).compact().singleton_expansion()
+    assert rigid.type == (2, 1, 1, 1)
+    assert same_structure(rigid.structure(), clique(3).singleton_expansion())
+    assert same_structure(
+        (rigid ** 2).structure(), clique(3).singleton_expansion() ** 2)
+
+def test_mixed_radix():
+    labels = MixedRadix("ab", range(3))
+    assert list(labels) == [labels[i] for i in range(len(labels))]
+    assert all(labels.index(x) == i for i, x in enumerate(labels))
@@ -55,3 +55,30 @@ def test_count():
     solutions = solve_minor_condition(clique(3), clique(3),
             parse_identities("p(x,y) = p(x,y)"))
     assert len(list(solutions)) == 12
+
+def test_minor_codes():
+    from itertools import product
+    from pcsptools.polymorphisms import minor_codes
+    pi = ((0, 1), (1, 0), (2, 1))
+    xs = list(product(range(3), repeat=2))
+    codes = [9 * x[1] + 3 * x[0] + x[1] for x in xs]
+    assert minor_codes(3, 2, pi).tolist() == codes
+
+def test_components():
+    from pcsptools.polymorphisms import Components
+    components = Components("abcdef")
+    components.add("a", "b")
+    components.add_many([2, 3], [3, 1])
+    assert components("c") == components("a") != components("e")
+    assert len(set(components)) == 3
+    labels = components.labelling()
+    assert labels[0] == labels[2] and labels[4] != labels[5]
+
+def test_cover():
+    from pcsptools.polymorphisms import cover
+    assert set(cover("abcd", ("ab", "ba", "cb"))) == {"c", "d"}
+    # long chains used to exceed the recursion limit
+    n = 10000
+    assert list(cover(range(n), ((i + 1, i) for i in range(n - 1)))) == [
+        n - 1
+    ]
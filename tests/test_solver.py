@@ -42,3 +42,44 @@ def test_singleton_expansion():
     assert rigid_clique.type == (2,) + tuple(1 for a in rigid_clique.domain)
     solutions = tuple(solver(rigid_clique.power(3), rigid_clique))
     assert len(solutions) == 3
+
+@pytest.mark.parametrize(
+    "encoding", ["pairwise", "sequential", "commander", "product", "binary"])
+def test_encodings(encoding):
+    from pcsptools.solver import csp_solver
+    import pycosat
+    encoded_solver = csp_solver(pycosat.itersolve, encoding=encoding)
+    solutions = tuple(encoded_solver(clique(3).power(2), clique(3)))
+    assert len(solutions) == 2*factorial(3)
+    assert len(tuple(encoded_solver(cycle(5), nae(3, 2)))) == 30
+
+STAND_IN_SOLVER = """
+import sys, pycosat
+with open(sys.argv[1]) as file:
+    clauses = [list(map(int, line.split()))[:-1]
+               for line in file if not line.startswith(("c", "p"))]
+model = pycosat.solve(clauses)
+if model == "UNSAT":
+    print("s UNSATISFIABLE")
+else:
+    print("s SATISFIABLE")
+    print("v", *model, 0)
+"""
+
+def test_dimacs_solver(tmp_path):
+    import sys
+    from pcsptools.solver import csp_solver, dimacs_solver
+    script = tmp_path / "solver.py"
+    script.write_text(STAND_IN_SOLVER)
+    external = csp_solver(dimacs_solver([sys.executable, str(script)]))
+    assert len(tuple(external(clique(3).power(2), clique(3)))) == 12
+    with pytest.raises(StopIteration):
+        _ = next(external(clique(4), clique(3)))
+
+def test_write_dimacs(tmp_path):
+    from pcsptools.solver import write_dimacs
+    with open(tmp_path / "instance.cnf", "w+") as file:
+        assert write_dimacs(iter([(1, -2), (3,)]), file) == (3, 2)
+    lines = (tmp_path / "instance.cnf").read_text().splitlines()
+    assert lines[0].split() == ["p", "cnf", "3", "2"]
+    assert lines[1:] == ["1 -2 0", "3 0"]